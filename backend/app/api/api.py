@@ -1,8 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.api.endpoints import auth, chat
+from app.core.rate_limit import rate_limit
 
 api_router = APIRouter()
 
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(chat.router, prefix="/chat", tags=["chat"]) 
\ No newline at end of file
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"], dependencies=[Depends(rate_limit)])
+api_router.include_router(chat.router, prefix="/chat", tags=["chat"], dependencies=[Depends(rate_limit)])
\ No newline at end of file
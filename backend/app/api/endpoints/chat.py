@@ -1,11 +1,13 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, UploadFile, File, Form
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, UploadFile, File, Form, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select
 
 from app.api.deps import get_current_active_user
 from app.db.database import get_db
+from app.db.search import search_messages
 from app.models.user import User
 from app.models.chat import Chat, Message
 from app.schemas.chat import (
@@ -14,13 +16,37 @@ from app.schemas.chat import (
     ChatSummary,
     MessageCreate,
     Message as MessageSchema,
+    MessageSearchResponse,
     TextProcessRequest,
     URLProcessRequest,
+    URLBatchProcessRequest,
 )
+from app.core.config import URL_MAX_BATCH_SIZE
 from app.services.ai_service import ai_service
+from app.services.url_service import url_service
 
 router = APIRouter()
 
+# Columns read as plain row tuples for the large read endpoints, which skip
+# ORM object construction and response_model validation (the returned dicts
+# must keep matching the response_model; see tests/test_chat_api.py)
+CHAT_COLUMNS = (Chat.id, Chat.title, Chat.user_id, Chat.created_at, Chat.updated_at)
+MESSAGE_COLUMNS = (
+    Message.id,
+    Message.chat_id,
+    Message.content,
+    Message.role,
+    Message.message_metadata,
+    Message.created_at,
+)
+
+def rows_to_dicts(columns, rows) -> List[dict]:
+    keys = [column.key for column in columns]
+    return [dict(zip(keys, row)) for row in rows]
+
+def json_response(data: Any) -> Response:
+    return Response(content=orjson.dumps(data), media_type="application/json")
+
 @router.get("/", response_model=List[ChatSummary])
 async def get_chats(
     skip: int = 0,
@@ -31,8 +57,18 @@ async def get_chats(
     """
     Retrieve all chats for current user.
     """
-    chats = (
-        db.query(Chat)
+    # Count messages in the same query (one indexed lookup per returned chat)
+    message_count = (
+        select(func.count(Message.id))
+        .where(Message.chat_id == Chat.id)
+        .correlate(Chat)
+        .scalar_subquery()
+        .label("message_count")
+    )
+    
+    columns = (Chat.id, Chat.title, Chat.created_at, Chat.updated_at, message_count)
+    rows = (
+        db.query(*columns)
         .filter(Chat.user_id == current_user.id)
         .order_by(desc(Chat.updated_at))
         .offset(skip)
@@ -40,21 +76,7 @@ async def get_chats(
         .all()
     )
     
-    # Create ChatSummary objects
-    result = []
-    for chat in chats:
-        message_count = db.query(Message).filter(Message.chat_id == chat.id).count()
-        result.append(
-            {
-                "id": chat.id,
-                "title": chat.title,
-                "created_at": chat.created_at,
-                "updated_at": chat.updated_at,
-                "message_count": message_count
-            }
-        )
-    
-    return result
+    return json_response(rows_to_dicts(columns, rows))
 
 @router.post("/", response_model=ChatSchema)
 async def create_chat(
@@ -76,6 +98,27 @@ async def create_chat(
     
     return chat
 
+@router.get("/search", response_model=MessageSearchResponse)
+async def search_chats(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Full-text search over the messages in the current user's chats.
+    """
+    rows = search_messages(db, current_user.id, q, skip=skip, limit=limit)
+    
+    return {
+        "query": q,
+        "skip": skip,
+        "limit": limit,
+        "has_more": len(rows) > limit,
+        "results": rows[:limit],
+    }
+
 @router.get("/{chat_id}", response_model=ChatSchema)
 async def get_chat(
     chat_id: int = Path(...),
@@ -86,7 +129,7 @@ async def get_chat(
     Get a specific chat by ID.
     """
     chat = (
-        db.query(Chat)
+        db.query(*CHAT_COLUMNS)
         .filter(Chat.id == chat_id, Chat.user_id == current_user.id)
         .first()
     )
@@ -94,7 +137,17 @@ async def get_chat(
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
     
-    return chat
+    messages = (
+        db.query(*MESSAGE_COLUMNS)
+        .filter(Message.chat_id == chat_id)
+        .order_by(Message.id)
+        .all()
+    )
+    
+    result = rows_to_dicts(CHAT_COLUMNS, [chat])[0]
+    result["messages"] = rows_to_dicts(MESSAGE_COLUMNS, messages)
+    
+    return json_response(result)
 
 @router.post("/{chat_id}/messages", response_model=MessageSchema)
 async def create_message(
@@ -118,6 +171,7 @@ async def create_message(
     # Create user message
     message = Message(
         chat_id=chat.id,
+        user_id=chat.user_id,
         content=message_in.content,
         role=message_in.role,
         message_metadata=message_in.message_metadata,
@@ -157,6 +211,7 @@ async def create_message(
             # Create AI message
             ai_message = Message(
                 chat_id=chat.id,
+                user_id=chat.user_id,
                 content=answer_content,
                 role="assistant",
             )
@@ -194,4 +249,32 @@ async def process_pdf(
     
     # Process PDF
     result = await ai_service.process_pdf(file_content, file.filename)
-    return result 
\ No newline at end of file
+    return result
+
+@router.post("/process-url", response_model=dict)
+async def process_url(
+    url_request: URLProcessRequest,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Fetch a web page or PDF by URL and generate summary and key points.
+    """
+    result = await url_service.process_url(url_request.url)
+    return result
+
+@router.post("/process-urls", response_model=dict)
+async def process_urls(
+    url_request: URLBatchProcessRequest,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Fetch several URLs concurrently and generate summary and key points for each.
+    """
+    if len(url_request.urls) > URL_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {URL_MAX_BATCH_SIZE} URLs can be processed at once",
+        )
+    
+    results = await url_service.process_urls(url_request.urls)
+    return {"results": results}
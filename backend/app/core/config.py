@@ -13,6 +13,18 @@ API_V1_PREFIX = "/api/v1"
 PROJECT_NAME = os.getenv("APP_NAME", "AI Content Assistant")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
+# Server Configuration (production entry point, see gunicorn_conf.py)
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 8000))
+WORKERS_PER_CORE = float(os.getenv("WORKERS_PER_CORE", 1))
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", 0))  # 0 = no cap
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 0))  # explicit worker count, 0 = derive from cores
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", 5))  # seconds
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", 2048))
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", 120))  # seconds a worker may be unresponsive
+SERVER_SHUTDOWN_MARGIN = int(os.getenv("SERVER_SHUTDOWN_MARGIN", 5))  # seconds left for shutdown hooks
+# SERVER_GRACEFUL_TIMEOUT is defined after the LLM settings it depends on
+
 # JWT Configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET", "your-super-secret-key-change-in-production")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
@@ -23,15 +35,61 @@ DATABASE_URL = os.getenv(
     "DATABASE_URL", "sqlite:///./app.db"
 )  # Default to SQLite if not specified
 
+# Response Compression Configuration
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", 4096))  # bytes, 0 disables
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 5))  # 1-9; 9 costs far more CPU for a few % smaller bodies
+
 # CORS Configuration
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+# Model Routing Configuration
+LLM_LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", "gpt-4o")
+LLM_SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "gpt-4o-mini")
+LLM_ROUTING_TARGET = os.getenv("LLM_ROUTING_TARGET", "latency")  # "latency", "cost" or "quality"
+LLM_SMALL_MODEL_MAX_TOKENS = int(os.getenv("LLM_SMALL_MODEL_MAX_TOKENS", 4000))  # estimated input tokens
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", 30))  # seconds, before falling back
+LLM_MAX_CONCURRENT_CHUNKS = int(os.getenv("LLM_MAX_CONCURRENT_CHUNKS", 8))  # per document
+LLM_ROUTING_LOG_FILE = os.getenv("LLM_ROUTING_LOG_FILE", "")  # JSON lines; stderr if empty
+
+# Seconds a worker gets on shutdown before gunicorn kills it. Open requests may
+# use all but SERVER_SHUTDOWN_MARGIN of it. The default lets a summary in flight
+# finish its slowest path (map then reduce, each timing out on the routed model
+# and again on the fallback); lowering it makes restarts faster but cancels such
+# requests instead of draining them.
+SERVER_GRACEFUL_TIMEOUT = int(
+    os.getenv("SERVER_GRACEFUL_TIMEOUT", 4 * LLM_REQUEST_TIMEOUT + SERVER_SHUTDOWN_MARGIN)
+)
+
 # File Upload Configuration
 UPLOAD_DIR = Path(__file__).resolve().parent.parent / "uploads"
 MAX_UPLOAD_SIZE = 20 * 1024 * 1024  # 20 MB
 
+# URL Ingestion Configuration
+URL_FETCH_TIMEOUT = float(os.getenv("URL_FETCH_TIMEOUT", 15))  # seconds, whole fetch
+URL_CONNECT_TIMEOUT = float(os.getenv("URL_CONNECT_TIMEOUT", 5))
+URL_MAX_DOWNLOAD_SIZE = int(os.getenv("URL_MAX_DOWNLOAD_SIZE", 10 * 1024 * 1024))  # 10 MB
+URL_MAX_CONNECTIONS = int(os.getenv("URL_MAX_CONNECTIONS", 50))
+URL_MAX_CONNECTIONS_PER_HOST = int(os.getenv("URL_MAX_CONNECTIONS_PER_HOST", 4))
+URL_MAX_BATCH_SIZE = int(os.getenv("URL_MAX_BATCH_SIZE", 20))
+URL_CACHE_SIZE = int(os.getenv("URL_CACHE_SIZE", 256))  # pages kept for conditional GETs
+URL_MAX_REDIRECTS = int(os.getenv("URL_MAX_REDIRECTS", 5))
+# Hosts that may be fetched even though they resolve to private/loopback
+# addresses (e.g. "localhost" for a local stand-in server in tests)
+URL_ALLOWED_PRIVATE_HOSTS = [
+    host.strip().lower() for host in os.getenv("URL_ALLOWED_PRIVATE_HOSTS", "").split(",") if host.strip()
+]
+
+# Rate Limiting Configuration
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_CRUD_PER_SECOND = float(os.getenv("RATE_LIMIT_CRUD_PER_SECOND", 10))
+RATE_LIMIT_CRUD_BURST = int(os.getenv("RATE_LIMIT_CRUD_BURST", 40))
+RATE_LIMIT_AI_PER_MINUTE = float(os.getenv("RATE_LIMIT_AI_PER_MINUTE", 12))
+RATE_LIMIT_AI_BURST = int(os.getenv("RATE_LIMIT_AI_BURST", 4))
+RATE_LIMIT_MAX_IN_FLIGHT = int(os.getenv("RATE_LIMIT_MAX_IN_FLIGHT", 4))  # concurrent requests per user
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")  # shared state for multi-worker deployments
+
 # Make sure upload directory exists
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True) 
\ No newline at end of file
@@ -0,0 +1,266 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import logging
+import math
+import re
+import time
+
+import jwt
+from fastapi import HTTPException, Request, status
+
+from app.core.config import (
+    JWT_SECRET_KEY,
+    JWT_ALGORITHM,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_CRUD_PER_SECOND,
+    RATE_LIMIT_CRUD_BURST,
+    RATE_LIMIT_AI_PER_MINUTE,
+    RATE_LIMIT_AI_BURST,
+    RATE_LIMIT_MAX_IN_FLIGHT,
+    RATE_LIMIT_REDIS_URL,
+    URL_MAX_BATCH_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Routes that call the LLM or parse documents; everything else is cheap CRUD
+AI_ROUTES = [
+    ("POST", re.compile(r"/chat/process-(text|pdf|url|urls)/?$")),
+    ("POST", re.compile(r"/chat/\d+/messages/?$")),
+]
+
+# AI routes that take a list of items (method, path, body field); each
+# distinct item costs one token instead of the whole request costing one
+BATCH_ROUTES = [
+    ("POST", re.compile(r"/chat/process-urls/?$"), "urls", URL_MAX_BATCH_SIZE),
+]
+
+# (tokens per second, burst size) per bucket class
+BUCKETS = {
+    "crud": (RATE_LIMIT_CRUD_PER_SECOND, RATE_LIMIT_CRUD_BURST),
+    "ai": (RATE_LIMIT_AI_PER_MINUTE / 60.0, RATE_LIMIT_AI_BURST),
+}
+
+# Seconds an in-flight counter survives in the shared backend if a worker dies
+IN_FLIGHT_TTL = 600
+
+
+class InMemoryBackend:
+    """Per-process token buckets and in-flight counters."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # Least recently used first, so the bucket idle the longest is evicted
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+
+    async def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        """Take cost tokens; return 0 if allowed, else seconds until the request would be.
+
+        A request costing more than the burst is allowed once the bucket is full
+        and leaves it in debt, so the average rate still holds.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+
+        needed = min(cost, burst)
+        wait = 0.0
+        if tokens >= needed:
+            tokens -= cost
+        else:
+            wait = (needed - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        count = self._in_flight.get(key, 0)
+        if count >= limit:
+            return False
+        self._in_flight[key] = count + 1
+        return True
+
+    async def release(self, key: str):
+        count = self._in_flight.get(key, 0) - 1
+        if count > 0:
+            self._in_flight[key] = count
+        else:
+            self._in_flight.pop(key, None)
+
+
+class RedisBackend:
+    """Token buckets and in-flight counters shared by all workers through Redis."""
+
+    TAKE_SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local needed = math.min(cost, burst)
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    local wait = 0
+    if tokens >= needed then
+        tokens = tokens - cost
+    else
+        wait = (needed - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+    return tostring(wait)
+    """
+
+    ACQUIRE_SCRIPT = """
+    local count = redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+    if count > tonumber(ARGV[1]) then
+        redis.call('DECR', KEYS[1])
+        return 0
+    end
+    return 1
+    """
+
+    # Never go below zero, e.g. when the counter expired while a request was running
+    RELEASE_SCRIPT = """
+    local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if count <= 1 then
+        redis.call('DEL', KEYS[1])
+    else
+        redis.call('DECR', KEYS[1])
+    end
+    """
+
+    def __init__(self, url: str):
+        # Optional dependency, only needed for multi-worker deployments
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._take = self._redis.register_script(self.TAKE_SCRIPT)
+        self._acquire = self._redis.register_script(self.ACQUIRE_SCRIPT)
+        self._release = self._redis.register_script(self.RELEASE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        return float(await self._take(keys=[f"ratelimit:{key}"], args=[rate, burst, cost]))
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        return bool(await self._acquire(keys=[f"inflight:{key}"], args=[limit, IN_FLIGHT_TTL]))
+
+    async def release(self, key: str):
+        await self._release(keys=[f"inflight:{key}"])
+
+
+_backend = None
+
+
+def get_backend():
+    """Return the configured backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = InMemoryBackend()
+        if RATE_LIMIT_REDIS_URL:
+            try:
+                _backend = RedisBackend(RATE_LIMIT_REDIS_URL)
+            except Exception as e:
+                # e.g. redis not installed or a malformed URL; limit per process instead
+                logger.error("Cannot use Redis for rate limiting, falling back to per-process limits: %s", e)
+    return _backend
+
+
+def reset_backend():
+    """Forget the current backend (and any connections it holds)."""
+    global _backend
+    _backend = None
+
+
+def _client_key(request: Request) -> str:
+    """Identify the caller by the user id in its token, or by address if anonymous."""
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+            if payload.get("user_id"):
+                return f"user:{payload['user_id']}"
+        except jwt.PyJWTError:
+            pass
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+def _bucket_for(request: Request) -> str:
+    for method, pattern in AI_ROUTES:
+        if request.method == method and pattern.search(request.url.path):
+            return "ai"
+    return "crud"
+
+
+async def _cost_for(request: Request) -> int:
+    for method, pattern, field, max_items in BATCH_ROUTES:
+        if request.method == method and pattern.search(request.url.path):
+            try:
+                items = (await request.json()).get(field)
+            except (ValueError, AttributeError):
+                # Malformed bodies are rejected by the endpoint's validation
+                return 1
+            if isinstance(items, list) and items:
+                return min(len({str(item) for item in items}), max_items)
+    return 1
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def _release(backend, client: str):
+    try:
+        await backend.release(client)
+    except Exception as e:
+        logger.warning("Rate limit backend unavailable: %s", e)
+
+
+async def rate_limit(request: Request):
+    """Router dependency enforcing per-user token buckets and an in-flight cap."""
+    if not RATE_LIMIT_ENABLED:
+        yield
+        return
+
+    backend = get_backend()
+    client = _client_key(request)
+    bucket = _bucket_for(request)
+    rate, burst = BUCKETS[bucket]
+    cost = await _cost_for(request)
+
+    backend_ok = True
+    acquired = False
+    wait = 0.0
+    try:
+        # Claim the slot first so a request rejected for concurrency keeps its token
+        acquired = await backend.acquire(client, RATE_LIMIT_MAX_IN_FLIGHT)
+        if acquired:
+            wait = await backend.take(f"{bucket}:{client}", rate, burst, cost)
+    except Exception as e:
+        # Fail open: a broken shared backend must not take the API down
+        logger.warning("Rate limit backend unavailable: %s", e)
+        backend_ok = False
+
+    if backend_ok and not acquired:
+        raise _too_many_requests("Too many concurrent requests", 1)
+    if wait > 0:
+        await _release(backend, client)
+        raise _too_many_requests("Rate limit exceeded", wait)
+
+    try:
+        yield
+    finally:
+        if acquired:
+            await _release(backend, client)
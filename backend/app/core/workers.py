@@ -0,0 +1,18 @@
+"""Gunicorn worker class for the production server (see gunicorn_conf.py)."""
+from uvicorn_worker import UvicornWorker
+
+from app.core.config import SERVER_GRACEFUL_TIMEOUT, SERVER_SHUTDOWN_MARGIN
+
+
+class GracefulUvicornWorker(UvicornWorker):
+    """Uvicorn worker that stops waiting for open requests before gunicorn's graceful_timeout.
+
+    Without a limit uvicorn waits for every open request (including long LLM
+    calls) and gunicorn kills the worker mid-shutdown; with it, the remaining
+    requests are cancelled and shutdown hooks still get to close clients.
+    """
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "timeout_graceful_shutdown": max(1, SERVER_GRACEFUL_TIMEOUT - SERVER_SHUTDOWN_MARGIN),
+    }
@@ -0,0 +1,296 @@
+"""Full-text search over chat messages.
+
+SQLite uses an FTS5 table whose rows carry an indexed owner token, so a query
+only intersects the posting lists of one user. PostgreSQL uses a trigger-
+maintained tsvector column with a btree_gin index on (user_id, content_tsv).
+
+Startup (setup_search_index) only runs cheap DDL. Backfilling existing rows
+and building the indexes are done by the migration; until it has finished,
+search on a database with existing messages falls back to LIKE:
+
+    python -m app.db.search
+"""
+from typing import List, Dict, Any
+import logging
+import re
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Dialects whose full-text index is ready to be queried
+_fts_dialects = set()
+
+# Rows updated per statement while backfilling
+BACKFILL_BATCH_SIZE = 10_000
+
+_SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        content, owner, tokenize='porter unicode61'
+    )
+"""
+
+# Created once every existing message is indexed; their presence marks the index as ready
+_SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, content, owner) VALUES (
+            new.id, new.content,
+            'u' || coalesce(new.user_id, (SELECT user_id FROM chats WHERE id = new.chat_id))
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        DELETE FROM messages_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content ON messages BEGIN
+        UPDATE messages_fts SET content = new.content WHERE rowid = new.id;
+    END
+    """,
+]
+
+_POSTGRES_SETUP = [
+    # Nullable columns without defaults are added without rewriting the table
+    "ALTER TABLE messages ADD COLUMN IF NOT EXISTS content_tsv tsvector",
+    "DROP TRIGGER IF EXISTS messages_content_tsv_update ON messages",
+    """
+    CREATE TRIGGER messages_content_tsv_update BEFORE INSERT OR UPDATE OF content ON messages
+    FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(content_tsv, 'pg_catalog.english', content)
+    """,
+]
+
+_POSTGRES_INDEX = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_user_content_tsv "
+    "ON messages USING GIN (user_id, content_tsv)"
+)
+
+# Declared with index=True on the models, but create_all skips existing tables.
+# Search joins messages to chats and the chat list counts messages per chat.
+_JOIN_INDEXES = [
+    "CREATE INDEX {concurrently} IF NOT EXISTS ix_messages_chat_id ON messages (chat_id)",
+    "CREATE INDEX {concurrently} IF NOT EXISTS ix_chats_user_id ON chats (user_id)",
+]
+
+
+def _sqlite_index_is_ready(conn) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'messages_fts_ai'")
+    ).first() is not None
+
+
+def _postgres_index_is_ready(conn) -> bool:
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an invalid index behind
+    return bool(conn.execute(text("""
+        SELECT i.indisvalid FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'ix_messages_user_content_tsv'
+    """)).scalar())
+
+
+def setup_search_index(engine: Engine):
+    """Prepare full-text search at startup using only cheap DDL.
+
+    New databases are fully set up. On existing ones search falls back to
+    LIKE until the migration has indexed the messages already stored.
+    """
+    dialect = engine.dialect.name
+
+    try:
+        with engine.begin() as conn:
+            if "user_id" not in {c["name"] for c in inspect(conn).get_columns("messages")}:
+                conn.execute(text("ALTER TABLE messages ADD COLUMN user_id INTEGER REFERENCES users (id)"))
+            empty = conn.execute(text("SELECT 1 FROM messages LIMIT 1")).first() is None
+
+            if dialect == "sqlite":
+                conn.execute(text(_SQLITE_TABLE))
+                if empty:
+                    for statement in _SQLITE_TRIGGERS:
+                        conn.execute(text(statement))
+                ready = _sqlite_index_is_ready(conn)
+            elif dialect == "postgresql":
+                for statement in _POSTGRES_SETUP:
+                    conn.execute(text(statement))
+                ready = empty or _postgres_index_is_ready(conn)
+            else:
+                return
+
+        if not ready:
+            logger.warning("Search index missing; run `python -m app.db.search`. Using LIKE until then")
+            return
+
+        if dialect == "postgresql":
+            # Creating the index is instant on an empty table, and a no-op once built
+            _create_postgres_index(engine)
+        _fts_dialects.add(dialect)
+    except SQLAlchemyError as e:
+        logger.warning("Full-text search index unavailable, falling back to LIKE: %s", e)
+
+
+def _create_postgres_index(engine: Engine):
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        if conn.execute(text(
+            "SELECT 1 FROM pg_class WHERE relname = 'ix_messages_user_content_tsv'"
+        )).first() and not _postgres_index_is_ready(conn):
+            conn.execute(text("DROP INDEX CONCURRENTLY ix_messages_user_content_tsv"))
+        conn.execute(text(_POSTGRES_INDEX))
+
+
+def migrate_search_index(engine: Engine, batch_size: int = BACKFILL_BATCH_SIZE):
+    """Backfill owners and index entries for existing messages, then build the index.
+
+    Works in batches so no statement holds locks for long; safe to re-run.
+    """
+    setup_search_index(engine)
+    dialect = engine.dialect.name
+
+    if dialect == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in _JOIN_INDEXES:
+                conn.execute(text(statement.format(concurrently="CONCURRENTLY")))
+    else:
+        with engine.begin() as conn:
+            for statement in _JOIN_INDEXES:
+                conn.execute(text(statement.format(concurrently="")))
+
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(text("""
+                UPDATE messages SET user_id = (SELECT user_id FROM chats WHERE chats.id = messages.chat_id)
+                WHERE id IN (
+                    SELECT id FROM messages
+                    WHERE user_id IS NULL AND chat_id IN (SELECT id FROM chats WHERE user_id IS NOT NULL)
+                    LIMIT :batch
+                )
+            """), {"batch": batch_size}).rowcount
+        if updated < batch_size:
+            break
+
+    if dialect == "sqlite" and dialect not in _fts_dialects:
+        while True:
+            with engine.begin() as conn:
+                last_batch = _sqlite_backfill_batch(conn, batch_size) < batch_size
+                if last_batch:
+                    # Same transaction as the last batch, so no new message is missed;
+                    # drop entries of messages deleted while backfilling
+                    conn.execute(text("DELETE FROM messages_fts WHERE rowid NOT IN (SELECT id FROM messages)"))
+                    for statement in _SQLITE_TRIGGERS:
+                        conn.execute(text(statement))
+            if last_batch:
+                break
+        _fts_dialects.add(dialect)
+    elif dialect == "postgresql":
+        while True:
+            with engine.begin() as conn:
+                updated = conn.execute(text("""
+                    UPDATE messages SET content_tsv = to_tsvector('pg_catalog.english', coalesce(content, ''))
+                    WHERE id IN (SELECT id FROM messages WHERE content_tsv IS NULL LIMIT :batch)
+                """), {"batch": batch_size}).rowcount
+            if updated < batch_size:
+                break
+        _create_postgres_index(engine)
+        _fts_dialects.add(dialect)
+
+
+def _sqlite_backfill_batch(conn, batch_size: int) -> int:
+    """Index up to batch_size messages that are not in messages_fts yet."""
+    return conn.execute(text("""
+        INSERT INTO messages_fts(rowid, content, owner)
+        SELECT id, content, 'u' || user_id FROM messages
+        WHERE id > coalesce((SELECT rowid FROM messages_fts ORDER BY rowid DESC LIMIT 1), 0)
+        ORDER BY id LIMIT :batch
+    """), {"batch": batch_size}).rowcount
+
+
+def _sqlite_match_query(user_id: int, query: str) -> str:
+    """Turn free text into a safe FTS5 query scoped to one owner.
+
+    All terms are required and the last one matches as a prefix.
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return f'owner : "u{int(user_id)}" AND content : ({" ".join(quoted)})'
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"%{escaped}%"
+
+
+def search_messages(
+    db: Session, user_id: int, query: str, skip: int = 0, limit: int = 20
+) -> List[Dict[str, Any]]:
+    """Return ranked messages from the user's chats matching a full-text query.
+
+    One row more than ``limit`` is fetched so callers can tell if another page exists.
+    """
+    dialect = db.get_bind().dialect.name
+    params = {"user_id": user_id, "limit": limit + 1, "skip": skip}
+
+    if dialect == "sqlite" and dialect in _fts_dialects:
+        params["q"] = _sqlite_match_query(user_id, query)
+        if not params["q"]:
+            return []
+        # The owner column has weight 0 so it does not affect ranking
+        sql = """
+            SELECT m.id AS message_id, m.chat_id, c.title AS chat_title, m.role, m.created_at,
+                   snippet(messages_fts, 0, '[', ']', '...', 16) AS snippet,
+                   bm25(messages_fts, 1.0, 0.0) AS rank
+            FROM messages_fts
+            JOIN messages m ON m.id = messages_fts.rowid
+            JOIN chats c ON c.id = m.chat_id
+            WHERE messages_fts MATCH :q AND c.user_id = :user_id
+            ORDER BY rank
+            LIMIT :limit OFFSET :skip
+        """
+    elif dialect == "postgresql" and dialect in _fts_dialects:
+        params["q"] = query
+        # Rank and page the user's matches first so ts_headline only runs on the returned rows
+        sql = """
+            SELECT hit.message_id, m.chat_id, c.title AS chat_title, m.role, m.created_at,
+                   ts_headline('pg_catalog.english', m.content, plainto_tsquery('pg_catalog.english', :q),
+                               'StartSel=[, StopSel=], MaxWords=24, MinWords=8') AS snippet,
+                   hit.rank
+            FROM (
+                SELECT m.id AS message_id, ts_rank_cd(m.content_tsv, query) AS rank
+                FROM messages m, plainto_tsquery('pg_catalog.english', :q) query
+                WHERE m.user_id = :user_id AND m.content_tsv @@ query
+                ORDER BY rank DESC
+                LIMIT :limit OFFSET :skip
+            ) hit
+            JOIN messages m ON m.id = hit.message_id
+            JOIN chats c ON c.id = m.chat_id
+            ORDER BY hit.rank DESC
+        """
+    else:
+        params["q"] = _like_pattern(query)
+        sql = """
+            SELECT m.id AS message_id, m.chat_id, c.title AS chat_title, m.role, m.created_at,
+                   substr(m.content, 1, 200) AS snippet, 0 AS rank
+            FROM messages m
+            JOIN chats c ON c.id = m.chat_id
+            WHERE m.content LIKE :q ESCAPE '!' AND c.user_id = :user_id
+            ORDER BY m.created_at DESC
+            LIMIT :limit OFFSET :skip
+        """
+
+    rows = db.execute(text(sql), params).mappings().all()
+    return [dict(row) for row in rows]
+
+
+if __name__ == "__main__":
+    from app.db.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    migrate_search_index(engine)
+    logger.info("Search index is up to date")
@@ -1,21 +1,50 @@
 import os
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.api import api_router
-from app.core.config import PROJECT_NAME, API_V1_PREFIX, ALLOWED_ORIGINS
+from app.core.config import (
+    PROJECT_NAME,
+    API_V1_PREFIX,
+    ALLOWED_ORIGINS,
+    RESPONSE_COMPRESSION_MIN_SIZE,
+    RESPONSE_GZIP_LEVEL,
+)
 from app.db.database import Base, engine, get_db
+from app.db.search import setup_search_index
 from app.models import user, chat
+from app.services.model_router import configure_routing_log
 
 # Create database tables (if they don't exist)
 Base.metadata.create_all(bind=engine)
 
+# Prepare full-text search over messages (run `python -m app.db.search` to index existing rows)
+setup_search_index(engine)
+
+# Record LLM routing decisions for analysis
+configure_routing_log()
+
 app = FastAPI(
     title=PROJECT_NAME,
     openapi_url=f"{API_V1_PREFIX}/openapi.json",
 )
 
+# Compress large responses (brotli when the optional brotli-asgi package is installed)
+if RESPONSE_COMPRESSION_MIN_SIZE > 0:
+    try:
+        from brotli_asgi import BrotliMiddleware
+
+        app.add_middleware(BrotliMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_SIZE)
+    except ImportError:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=RESPONSE_COMPRESSION_MIN_SIZE,
+            compresslevel=RESPONSE_GZIP_LEVEL,
+        )
+
 # Set CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -60,8 +89,20 @@ async def create_test_user():
             )
             
             db.add(test_user)
-            db.commit()
-            print(f"Created test user: {test_email}")
+            try:
+                db.commit()
+                print(f"Created test user: {test_email}")
+            except IntegrityError:
+                # Another worker created it first
+                db.rollback()
+        
+        db.close()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    from app.services.url_service import url_service
+
+    await url_service.aclose()
 
 if __name__ == "__main__":
     import uvicorn
@@ -9,7 +9,7 @@ class Chat(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -21,7 +21,8 @@ class Message(Base):
     __tablename__ = "messages"
     
     id = Column(Integer, primary_key=True, index=True)
-    chat_id = Column(Integer, ForeignKey("chats.id"))
+    chat_id = Column(Integer, ForeignKey("chats.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Owner, copied from the chat for search
     content = Column(Text)
     role = Column(String)  # "user" or "assistant"
     message_metadata = Column(JSON, nullable=True)  # For storing additional information
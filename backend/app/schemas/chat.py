@@ -44,9 +44,28 @@ class ChatSummary(BaseModel):
     class Config:
         orm_mode = True
 
+class MessageSearchResult(BaseModel):
+    message_id: int
+    chat_id: int
+    chat_title: Optional[str] = None
+    role: str
+    snippet: Optional[str] = None
+    rank: float
+    created_at: datetime
+
+class MessageSearchResponse(BaseModel):
+    query: str
+    skip: int
+    limit: int
+    has_more: bool
+    results: List[MessageSearchResult]
+
 # Request models
 class TextProcessRequest(BaseModel):
     text: str
     
 class URLProcessRequest(BaseModel):
-    url: str 
\ No newline at end of file
+    url: str
+
+class URLBatchProcessRequest(BaseModel):
+    urls: List[str] = Field(..., min_items=1)
\ No newline at end of file
@@ -1 +1,2 @@
-from app.services.ai_service import ai_service 
\ No newline at end of file
+from app.services.ai_service import ai_service
+from app.services.url_service import url_service
\ No newline at end of file
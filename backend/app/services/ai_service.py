@@ -3,20 +3,22 @@ import io
 import os
 from PyPDF2 import PdfReader
 import tempfile
-from langchain.chains.summarize import load_summarize_chain
+import asyncio
 from langchain.docstore.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 
-from app.core.config import OPENAI_API_KEY, MAX_UPLOAD_SIZE, UPLOAD_DIR
+from app.core.config import OPENAI_API_KEY, MAX_UPLOAD_SIZE, UPLOAD_DIR, LLM_MAX_CONCURRENT_CHUNKS
+from app.services.model_router import ModelRouter, SUMMARY, KEY_POINTS, QA, CHUNK_MAP
+from app.services.single_flight import SingleFlight, content_key
 
 # Initialize OpenAI
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 
 class AIService:
     def __init__(self):
-        self.llm = ChatOpenAI(temperature=0, model_name="gpt-4o")
+        self.router = ModelRouter()
+        self.single_flight = SingleFlight()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=8000,
             chunk_overlap=200,
@@ -25,15 +27,22 @@ class AIService:
     
     async def process_text(self, text: str) -> Dict[str, Any]:
         """Process a text input and generate a summary and key points."""
+        # Identical texts processed concurrently share one pipeline run
+        result = await self.single_flight.do(
+            content_key("text", text), lambda: self._process_text(text)
+        )
+        return dict(result)
+    
+    async def _process_text(self, text: str) -> Dict[str, Any]:
         try:
             # Split text into chunks if needed
             docs = self.text_splitter.create_documents([text])
 
-            # Create summary
-            summary = await self._generate_summary(docs)
-
-            # Extract key points
-            key_points = await self._extract_key_points(docs)
+            # Create summary and extract key points concurrently
+            summary, key_points = await asyncio.gather(
+                self._generate_summary(docs),
+                self._extract_key_points(docs),
+            )
  
             return {
                 "summary": summary,
@@ -49,6 +58,23 @@ class AIService:
     
     async def process_pdf(self, file_content: bytes, filename: str) -> Dict[str, Any]:
         """Process a PDF file and extract its content for summarization."""
+        # Identical uploads processed concurrently share one extraction and pipeline run
+        result = await self.single_flight.do(
+            content_key("pdf", file_content),
+            lambda: self._process_pdf(file_content, filename),
+        )
+        result = dict(result)
+        
+        if result["status"] == "success":
+            # Add source information
+            result["source"] = {
+                "type": "pdf",
+                "filename": filename
+            }
+        
+        return result
+    
+    async def _process_pdf(self, file_content: bytes, filename: str) -> Dict[str, Any]:
         try:
             # Save the PDF temporarily
             temp_path = UPLOAD_DIR / filename
@@ -59,15 +85,7 @@ class AIService:
             text = self._extract_text_from_pdf(temp_path)
             
             # Process the extracted text
-            result = await self.process_text(text)
-            
-            # Add source information
-            result["source"] = {
-                "type": "pdf",
-                "filename": filename
-            }
-            
-            return result
+            return await self.process_text(text)
             
         except Exception as e:
             return {
@@ -77,6 +95,14 @@ class AIService:
     
     async def answer_question(self, query: str, context: str) -> Dict[str, Any]:
         """Answer a question based on the provided context."""
+        # The same question over the same context in flight is answered once
+        result = await self.single_flight.do(
+            content_key("qa", query, context),
+            lambda: self._answer_question(query, context),
+        )
+        return dict(result)
+    
+    async def _answer_question(self, query: str, context: str) -> Dict[str, Any]:
         try:
             # Prepare template for question answering
             template = """
@@ -97,9 +123,9 @@ class AIService:
                 input_variables=["context", "question"]
             )
             
-            # Generate answer using the LLM
+            # Generate answer using the routed LLM
             input_val = prompt.format(context=context, question=query)
-            result = await self.llm.ainvoke(input_val)
+            result = await self.router.ainvoke(QA, input_val)
             
             return {
                 "answer": result,
@@ -125,13 +151,20 @@ class AIService:
         
         prompt = PromptTemplate(template=summary_template, input_variables=["text"])
         
-        chain = load_summarize_chain(
-            llm=self.llm,
-            chain_type="stuff", 
-            prompt=prompt
-        )
+        # Long inputs: summarize each chunk concurrently, then summarize the summaries
+        if len(docs) > 1:
+            limit = asyncio.Semaphore(LLM_MAX_CONCURRENT_CHUNKS)
+            
+            async def summarize_chunk(doc: Document) -> str:
+                async with limit:
+                    return await self.router.ainvoke(CHUNK_MAP, prompt.format(text=doc.page_content))
+            
+            chunk_summaries = await asyncio.gather(*(summarize_chunk(doc) for doc in docs))
+            text = "\n\n".join(chunk_summary.strip() for chunk_summary in chunk_summaries)
+        else:
+            text = " ".join([doc.page_content for doc in docs])
         
-        result = await chain.arun(docs)
+        result = await self.router.ainvoke(SUMMARY, prompt.format(text=text))
         return result.strip()
     
     async def _extract_key_points(self, docs: List[Document]) -> List[str]:
@@ -150,13 +183,8 @@ class AIService:
         # Join all documents into a single text
         full_text = " ".join([doc.page_content for doc in docs])
         
-        # Generate key points using the LLM
-        result = await self.llm.ainvoke(prompt.format(text=full_text))
-        
-        # Extract content from result if it's an object
-        content = result
-        if hasattr(result, "content"):
-            content = result.content
+        # Generate key points using the routed LLM
+        content = await self.router.ainvoke(KEY_POINTS, prompt.format(text=full_text))
             
         # Parse the result into a list of key points
         key_points = [point.strip() for point in content.strip().split("\n") if point.strip()]
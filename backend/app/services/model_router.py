@@ -0,0 +1,185 @@
+from typing import Dict, Any, Optional
+from datetime import datetime
+import asyncio
+import json
+import logging
+import time
+
+from langchain_openai import ChatOpenAI
+
+from app.core.config import (
+    LLM_LARGE_MODEL,
+    LLM_SMALL_MODEL,
+    LLM_ROUTING_TARGET,
+    LLM_SMALL_MODEL_MAX_TOKENS,
+    LLM_REQUEST_TIMEOUT,
+    LLM_ROUTING_LOG_FILE,
+)
+
+logger = logging.getLogger("app.routing")
+
+# Tasks the router knows about
+SUMMARY = "summary"
+KEY_POINTS = "key_points"
+QA = "qa"
+CHUNK_MAP = "chunk_map"
+
+# Tasks whose output is short and mechanical enough for the small model at any
+# input size unless the quality target is selected.
+SMALL_MODEL_TASKS = {KEY_POINTS, CHUNK_MAP}
+
+
+class LLMTimeoutError(Exception):
+    """Raised when a task timed out on its routed model and on the fallback."""
+
+
+def configure_routing_log(path: str = LLM_ROUTING_LOG_FILE):
+    """Emit one JSON line per routing decision to a file (or stderr)."""
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # Keep the JSON lines out of the application log
+    logger.propagate = False
+
+
+class RoutingDecision:
+    def __init__(
+        self,
+        task: str,
+        model: str,
+        fallback_model: Optional[str],
+        estimated_tokens: int,
+        target: str,
+        reason: str,
+    ):
+        self.task = task
+        self.model = model
+        self.fallback_model = fallback_model
+        self.estimated_tokens = estimated_tokens
+        self.target = target
+        self.reason = reason
+        self.used_model = model
+        self.outcome = "pending"
+        self.latency_ms: Optional[float] = None
+        self.created_at = datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task": self.task,
+            "model": self.model,
+            "fallback_model": self.fallback_model,
+            "used_model": self.used_model,
+            "estimated_tokens": self.estimated_tokens,
+            "target": self.target,
+            "reason": self.reason,
+            "outcome": self.outcome,
+            "latency_ms": self.latency_ms,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class ModelRouter:
+    """Choose an LLM per task from the input size and the configured target.
+
+    Targets:
+        latency -- small model for short inputs, large model for long ones
+        cost    -- small model everywhere
+        quality -- large model everywhere
+    A call that times out is retried once on the other model.
+    """
+
+    def __init__(
+        self,
+        large_model: str = LLM_LARGE_MODEL,
+        small_model: str = LLM_SMALL_MODEL,
+        target: str = LLM_ROUTING_TARGET,
+        small_model_max_tokens: int = LLM_SMALL_MODEL_MAX_TOKENS,
+        timeout: float = LLM_REQUEST_TIMEOUT,
+    ):
+        if target not in ("latency", "cost", "quality"):
+            raise ValueError(f"Unknown routing target: {target}")
+        self.large_model = large_model
+        self.small_model = small_model
+        self.target = target
+        self.small_model_max_tokens = small_model_max_tokens
+        self.timeout = timeout
+        self._clients: Dict[str, ChatOpenAI] = {}
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Cheap token estimate (~4 characters per token for English text)."""
+        return len(text) // 4 + 1
+
+    def get_llm(self, model: str) -> ChatOpenAI:
+        """Return the client for a model, creating it on first use."""
+        if model not in self._clients:
+            self._clients[model] = ChatOpenAI(temperature=0, model_name=model)
+        return self._clients[model]
+
+    def reset_clients(self):
+        """Drop all cached clients so new ones (and connections) are created."""
+        self._clients.clear()
+
+    def route(self, task: str, text: str) -> RoutingDecision:
+        """Pick the primary and fallback model for a task and input."""
+        tokens = self.estimate_tokens(text)
+
+        if self.target == "quality":
+            model, reason = self.large_model, "quality target"
+        elif self.target == "cost":
+            model, reason = self.small_model, "cost target"
+        elif task in SMALL_MODEL_TASKS:
+            model, reason = self.small_model, f"{task} task"
+        elif tokens <= self.small_model_max_tokens:
+            model, reason = self.small_model, f"input <= {self.small_model_max_tokens} tokens"
+        else:
+            model, reason = self.large_model, f"input > {self.small_model_max_tokens} tokens"
+
+        fallback = self.large_model if model == self.small_model else self.small_model
+        if fallback == model:
+            fallback = None
+
+        return RoutingDecision(task, model, fallback, tokens, self.target, reason)
+
+    async def ainvoke(self, task: str, prompt: str) -> str:
+        """Run a prompt on the routed model and return the response text."""
+        decision = self.route(task, prompt)
+        start = time.perf_counter()
+
+        try:
+            try:
+                result = await self._call(decision.model, prompt)
+                decision.outcome = "ok"
+            except asyncio.TimeoutError:
+                if decision.fallback_model is None:
+                    raise
+                decision.used_model = decision.fallback_model
+                result = await self._call(decision.fallback_model, prompt)
+                decision.outcome = "fallback"
+        except asyncio.TimeoutError:
+            decision.outcome = "timeout"
+            models = " and ".join(m for m in (decision.model, decision.fallback_model) if m)
+            raise LLMTimeoutError(
+                f"{task} request timed out after {self.timeout:g}s on {models}"
+            ) from None
+        except Exception:
+            decision.outcome = "error"
+            raise
+        finally:
+            decision.latency_ms = round((time.perf_counter() - start) * 1000, 1)
+            self._record(decision)
+
+        if hasattr(result, "content"):
+            result = result.content
+        return result
+
+    async def _call(self, model: str, prompt: str):
+        return await asyncio.wait_for(
+            self.get_llm(model).ainvoke(prompt), timeout=self.timeout
+        )
+
+    def _record(self, decision: RoutingDecision):
+        logger.info(json.dumps(decision.to_dict()))
@@ -0,0 +1,68 @@
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(namespace: str, *parts) -> str:
+    """Build a coalescing key from a namespace and the hashed request content."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one in-flight computation.
+
+    The first caller starts the work; callers arriving while it runs wait for
+    the same result. A waiter that is cancelled (e.g. its client disconnected)
+    only stops waiting; the work is cancelled once no waiter is left. Nothing
+    is kept after the computation finishes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+            logger.debug(
+                "Joined in-flight call %s (%d coalesced so far, %d in flight)",
+                key, self.coalesced, self.in_flight(),
+            )
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every waiter gave up, nobody needs the result any more; later
+                # callers must start fresh rather than join the cancelled task
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,403 @@
+from typing import List, Dict, Any, Iterable, Optional
+from collections import OrderedDict
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+import asyncio
+import codecs
+import hashlib
+import io
+import ipaddress
+import socket
+
+import httpx
+from PyPDF2 import PdfReader
+
+from app.core.config import (
+    URL_FETCH_TIMEOUT,
+    URL_CONNECT_TIMEOUT,
+    URL_MAX_DOWNLOAD_SIZE,
+    URL_MAX_CONNECTIONS,
+    URL_MAX_CONNECTIONS_PER_HOST,
+    URL_CACHE_SIZE,
+    URL_MAX_REDIRECTS,
+    URL_ALLOWED_PRIVATE_HOSTS,
+)
+from app.services.ai_service import ai_service
+from app.services.single_flight import SingleFlight
+
+
+class URLFetchError(Exception):
+    """Raised when a URL cannot be fetched or its content cannot be extracted."""
+
+
+class MainContentExtractor(HTMLParser):
+    """Incremental HTML-to-text parser that keeps only the main readable content.
+
+    Text inside <main>/<article> is preferred when the page has any; boilerplate
+    elements (scripts, navigation, headers, footers, ...) are always dropped.
+    """
+
+    SKIP_TAGS = {
+        "script", "style", "noscript", "template", "svg", "iframe",
+        "nav", "header", "footer", "aside", "form", "button", "select",
+    }
+    MAIN_TAGS = {"main", "article"}
+    BLOCK_TAGS = {
+        "p", "div", "section", "br", "li", "tr", "h1", "h2", "h3",
+        "h4", "h5", "h6", "pre", "blockquote", "table", "ul", "ol",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._all_parts: List[str] = []
+        self._main_parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.MAIN_TAGS:
+            self._main_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.MAIN_TAGS:
+            self._main_depth = max(0, self._main_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data):
+        if data.strip():
+            self._append(data)
+
+    def _append(self, data: str):
+        if self._skip_depth:
+            return
+        self._all_parts.append(data)
+        if self._main_depth:
+            self._main_parts.append(data)
+
+    def get_text(self) -> str:
+        parts = self._main_parts if "".join(self._main_parts).strip() else self._all_parts
+        lines = (" ".join(line.split()) for line in "".join(parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+class _CacheEntry:
+    """Validators and summary for one URL.
+
+    The extracted text is only kept until a summary has been stored for it.
+    """
+
+    def __init__(
+        self,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_type: str,
+        text: str,
+    ):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+        self.text: Optional[str] = text
+        self.text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class _HostLimit:
+    """Per-host connection cap, dropped once no fetch for the host is running."""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class URLService:
+    def __init__(
+        self,
+        timeout: float = URL_FETCH_TIMEOUT,
+        max_bytes: int = URL_MAX_DOWNLOAD_SIZE,
+        max_connections: int = URL_MAX_CONNECTIONS,
+        max_connections_per_host: int = URL_MAX_CONNECTIONS_PER_HOST,
+        cache_size: int = URL_CACHE_SIZE,
+        max_redirects: int = URL_MAX_REDIRECTS,
+        allowed_private_hosts: Iterable[str] = URL_ALLOWED_PRIVATE_HOSTS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.cache_size = cache_size
+        self.max_redirects = max_redirects
+        self.allowed_private_hosts = {host.lower() for host in allowed_private_hosts}
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, _HostLimit] = {}
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._single_flight = SingleFlight()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared, connection-pooled HTTP client (created on first use)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=URL_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                # Redirects are followed by _download so every hop is checked
+                follow_redirects=False,
+                headers={"User-Agent": "AI-Content-Assistant/1.0"},
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._host_limits.clear()
+
+    def reset(self):
+        """Forget the pooled client without closing it (e.g. in a forked child)."""
+        self._client = None
+        self._host_limits.clear()
+
+    async def process_url(self, url: str) -> Dict[str, Any]:
+        """Fetch a URL and generate a summary and key points for its content."""
+        try:
+            # Concurrent requests for the same URL share one download
+            entry = await self._single_flight.do(f"url:{url}", lambda: self._fetch(url))
+
+            reused = entry.result is not None
+            if not reused:
+                result = await ai_service.process_text(entry.text)
+                if result.get("status") != "success":
+                    return result
+                entry.result = result
+                # Later revalidations only need the hash and validators
+                entry.text = None
+
+            return {
+                **entry.result,
+                "source": {
+                    "type": "url",
+                    "url": url,
+                    "content_type": entry.content_type,
+                },
+                "cached": reused,
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": str(e),
+                "source": {"type": "url", "url": url},
+            }
+
+    async def process_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Process several URLs concurrently, returning results in input order."""
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.process_url(url) for url in unique))
+        by_url = dict(zip(unique, results))
+        return [by_url[url] for url in urls]
+
+    async def _fetch(self, url: str):
+        """Fetch and extract a URL, revalidating any cached copy.
+
+        The returned entry carries the stored summary if the text is unchanged.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise URLFetchError(f"Unsupported URL: {url}")
+
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        host = parts.netloc.lower()
+        host_limit = self._host_limits.get(host)
+        if host_limit is None:
+            host_limit = self._host_limits[host] = _HostLimit(self.max_connections_per_host)
+        host_limit.users += 1
+        try:
+            async with host_limit.semaphore:
+                entry = await asyncio.wait_for(
+                    self._download(url, headers, cached), timeout=self.timeout
+                )
+        except asyncio.TimeoutError:
+            raise URLFetchError(f"Timed out fetching {url}")
+        except httpx.HTTPError as e:
+            raise URLFetchError(f"Failed to fetch {url}: {e}")
+        finally:
+            # Hosts come from user input; keep only the ones being fetched
+            host_limit.users -= 1
+            if host_limit.users == 0:
+                del self._host_limits[host]
+
+        if cached is not None and entry is not cached and entry.text_hash == cached.text_hash:
+            entry.result = cached.result
+            if entry.result is not None:
+                entry.text = None
+        self._remember(url, entry)
+        return entry
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            raise URLFetchError(f"Could not resolve host {host}")
+        return [info[4][0].split("%")[0] for info in infos]
+
+    async def _check_destination(self, url: str) -> Optional[str]:
+        """Refuse URLs whose host resolves to a loopback, private or otherwise non-public address.
+
+        Returns the validated address to connect to, or None for allowed private hosts.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise URLFetchError(f"Unsupported URL: {url}")
+
+        host = parts.hostname.lower()
+        if host in self.allowed_private_hosts:
+            return None
+
+        try:
+            addresses = [ipaddress.ip_address(host)]
+        except ValueError:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            addresses = [ipaddress.ip_address(address) for address in await self._resolve(host, port)]
+
+        for address in addresses:
+            if address.version == 6 and address.ipv4_mapped:
+                address = address.ipv4_mapped
+            if not address.is_global or address.is_multicast:
+                raise URLFetchError(f"Refusing to fetch {url}: {host} is not a public address")
+        return str(addresses[0])
+
+    def _pinned_request(self, url: str, address: Optional[str], headers: Dict[str, str]) -> httpx.Request:
+        """Build a request that connects to the validated address instead of resolving the host again.
+
+        A second lookup could return a different (private) address, e.g. through DNS
+        rebinding. The original host is still sent in the Host header and used for
+        TLS SNI and certificate verification.
+        """
+        if address is None:
+            return self.client.build_request("GET", url, headers=headers)
+        target = httpx.URL(url)
+        return self.client.build_request(
+            "GET",
+            target.copy_with(host=address),
+            headers={**headers, "Host": target.netloc.decode("ascii")},
+            extensions={"sni_hostname": target.host},
+        )
+
+    async def _download(
+        self, url: str, headers: Dict[str, str], cached: Optional[_CacheEntry]
+    ) -> _CacheEntry:
+        for _ in range(self.max_redirects + 1):
+            address = await self._check_destination(url)
+            request = self._pinned_request(url, address, headers)
+            response = await self.client.send(request, stream=True)
+            try:
+                if response.has_redirect_location:
+                    url = str(httpx.URL(url).join(response.headers["Location"]))
+                    continue
+                return await self._read_response(url, response, cached)
+            finally:
+                await response.aclose()
+
+        raise URLFetchError(f"Too many redirects fetching {url}")
+
+    async def _read_response(
+        self, url: str, response: httpx.Response, cached: Optional[_CacheEntry]
+    ) -> _CacheEntry:
+        if response.status_code == 304 and cached is not None:
+            return cached
+        if response.status_code >= 400:
+            raise URLFetchError(f"{url} returned HTTP {response.status_code}")
+
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise URLFetchError(f"{url} is larger than {self.max_bytes} bytes")
+
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        is_pdf = content_type == "application/pdf" or (
+            not content_type and urlsplit(url).path.lower().endswith(".pdf")
+        )
+
+        if is_pdf:
+            text = await self._read_pdf(url, response)
+        elif content_type in ("", "text/html", "application/xhtml+xml", "text/plain"):
+            text = await self._read_html(url, response, plain=content_type == "text/plain")
+        else:
+            raise URLFetchError(f"Unsupported content type: {content_type}")
+
+        if not text.strip():
+            raise URLFetchError(f"No text content found at {url}")
+
+        return _CacheEntry(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_type=content_type or "text/html",
+            text=text,
+        )
+
+    async def _iter_limited(self, url: str, response: httpx.Response):
+        """Yield body chunks, aborting once the download size limit is exceeded."""
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > self.max_bytes:
+                raise URLFetchError(f"{url} is larger than {self.max_bytes} bytes")
+            yield chunk
+
+    async def _read_html(self, url: str, response: httpx.Response, plain: bool = False) -> str:
+        """Parse an HTML body chunk by chunk as it arrives."""
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        if plain:
+            parts = []
+            async for chunk in self._iter_limited(url, response):
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
+
+        parser = MainContentExtractor()
+        async for chunk in self._iter_limited(url, response):
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        return parser.get_text()
+
+    async def _read_pdf(self, url: str, response: httpx.Response) -> str:
+        """Spool a PDF body into memory and extract its text off the event loop."""
+        buffer = io.BytesIO()
+        async for chunk in self._iter_limited(url, response):
+            buffer.write(chunk)
+        buffer.seek(0)
+        return await asyncio.to_thread(self._extract_text_from_pdf, buffer)
+
+    def _extract_text_from_pdf(self, stream: io.BytesIO) -> str:
+        pdf = PdfReader(stream)
+        return "".join(page.extract_text() or "" for page in pdf.pages)
+
+    def _remember(self, url: str, entry: _CacheEntry):
+        self._cache[url] = entry
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+# Create a singleton instance
+url_service = URLService()
@@ -0,0 +1,36 @@
+import asyncio
+import hashlib
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """Deterministic stand-in for a chat model with configurable latency.
+
+    The same prompt always produces the same response and the same delay, so
+    two benchmark runs only differ by the code under test.
+    """
+
+    def __init__(self, latency_ms: float = 200.0, jitter: float = 0.2):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.calls = 0
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        self.calls += 1
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+        # Spread delays over [1 - jitter, 1 + jitter] times the base latency
+        spread = int(digest[:8], 16) / 0xFFFFFFFF * 2 - 1
+        await asyncio.sleep(self.latency_ms * (1 + spread * self.jitter) / 1000)
+
+        if "most important points" in prompt:
+            content = "\n".join(f"{i}. Key point {digest[i * 4:i * 4 + 8]}" for i in range(1, 6))
+        else:
+            content = f"Fake response {digest[:12]}. " + " ".join(
+                f"word{int(digest[i:i + 2], 16)}" for i in range(0, 60, 2)
+            )
+        return FakeMessage(content)
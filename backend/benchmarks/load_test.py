@@ -0,0 +1,326 @@
+"""End-to-end load test against an in-process app with a fake LLM.
+
+Run from the backend directory:
+
+    python -m benchmarks.load_test --requests 200 --concurrency 20 --llm-latency-ms 150
+    python -m benchmarks.load_test --compare benchmarks/results/<previous>.json
+
+Each run seeds a fresh SQLite database, drives the main endpoints concurrently
+and writes p50/p95/p99 latency, throughput and event-loop lag per endpoint to a
+JSON file named after the current commit.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SAMPLE_TEXT = " ".join(
+    f"Paragraph {i}: the quarterly report shows revenue growth driven by new customers "
+    f"in the enterprise market, while operating costs stayed flat and risk remained low."
+    for i in range(40)
+)
+
+
+def _configure_environment(database_path: str):
+    """Point the app at a throwaway database before it is imported."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["ENVIRONMENT"] = "benchmark"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+
+def _make_pdf(lines: List[str]) -> bytes:
+    """Build a minimal one-page PDF with the given text lines."""
+    escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+    stream = "BT /F1 10 Tf 72 750 Td 12 TL " + " ".join(f"({line}) '" for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode("latin-1")
+    return pdf
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 2)
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic sleeper."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append((time.perf_counter() - start - self.interval) * 1000)
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+async def _run_scenario(
+    name: str,
+    make_request: Callable[[int], Awaitable[Any]],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    limit = asyncio.Semaphore(concurrency)
+    monitor = LoopLagMonitor()
+
+    async def one(i: int):
+        nonlocal errors
+        async with limit:
+            start = time.perf_counter()
+            response = await make_request(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    result = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(max(latencies), 2),
+        },
+        "loop_lag_ms": {
+            "p50": _percentile(monitor.samples, 50),
+            "p99": _percentile(monitor.samples, 99),
+            "max": round(max(monitor.samples, default=0.0), 2),
+        },
+    }
+    print(
+        f"{name:<16} {result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {result['latency_ms']['p50']:>8.1f} ms  p95 {result['latency_ms']['p95']:>8.1f} ms  "
+        f"p99 {result['latency_ms']['p99']:>8.1f} ms  lag p99 {result['loop_lag_ms']['p99']:>7.1f} ms  "
+        f"errors {errors}"
+    )
+    return result
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from app.core.config import API_V1_PREFIX, UPLOAD_DIR
+    from app.core.security import create_access_token
+    from app.db.database import SessionLocal
+    from app.main import app
+    from app.services.ai_service import ai_service
+    from benchmarks.fake_llm import FakeLLM
+    from benchmarks.seed import BENCHMARK_PASSWORD, seed_database
+
+    fake_llm = FakeLLM(latency_ms=args.llm_latency_ms, jitter=args.llm_jitter)
+    ai_service.router.get_llm = lambda model: fake_llm
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seeded = seed_database(
+            db, args.users, args.chats_per_user, args.messages_per_chat, seed=args.seed
+        )
+        print(f"Seeded database in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+    users = seeded["users"]
+    tokens = {user["id"]: create_access_token(user["id"]) for user in users}
+    # Distinct content per request, like process_text, so identical uploads are
+    # not coalesced into one pipeline run; built up front to stay out of the timings
+    pdf_lines = [SAMPLE_TEXT[i:i + 90] for i in range(0, 4000, 90)]
+    pdfs = [_make_pdf([f"Request {i}."] + pdf_lines) for i in range(args.requests)]
+
+    def auth(i: int):
+        user = users[i % len(users)]
+        return user, {"Authorization": f"Bearer {tokens[user['id']]}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=f"http://benchmark{API_V1_PREFIX}", timeout=None
+    ) as client:
+
+        async def login(i: int):
+            user = users[i % len(users)]
+            return await client.post(
+                "/auth/login", data={"username": user["email"], "password": BENCHMARK_PASSWORD}
+            )
+
+        async def list_chats(i: int):
+            _, headers = auth(i)
+            return await client.get("/chat/", headers=headers)
+
+        async def post_message(i: int):
+            user, headers = auth(i)
+            chats = seeded["chats_by_user"][user["id"]]
+            chat_id = chats[(i // len(users)) % len(chats)]
+            return await client.post(
+                f"/chat/{chat_id}/messages",
+                json={"content": f"What does the document say about item {i}?", "role": "user"},
+                headers=headers,
+            )
+
+        async def process_text(i: int):
+            _, headers = auth(i)
+            return await client.post(
+                "/chat/process-text", json={"text": f"Request {i}. {SAMPLE_TEXT}"}, headers=headers
+            )
+
+        async def process_pdf(i: int):
+            _, headers = auth(i)
+            return await client.post(
+                "/chat/process-pdf",
+                files={"file": ("benchmark.pdf", pdfs[i], "application/pdf")},
+                headers=headers,
+            )
+
+        scenarios = {
+            "auth_login": (login, args.login_requests),
+            "list_chats": (list_chats, args.requests),
+            "post_message": (post_message, args.requests),
+            "process_text": (process_text, args.requests),
+            "process_pdf": (process_pdf, args.requests),
+        }
+
+        results = {}
+        for name, (make_request, requests) in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = await _run_scenario(name, make_request, requests, args.concurrency)
+
+    # process_pdf keeps a copy of every upload
+    (UPLOAD_DIR / "benchmark.pdf").unlink(missing_ok=True)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                key: value for key, value in vars(args).items() if key not in ("output", "compare")
+            },
+            "llm_calls": fake_llm.calls,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], previous_path: str):
+    """Print the relative change of key metrics against a previous result file."""
+    with open(previous_path) as f:
+        previous = json.load(f)
+
+    print(f"\nChange vs {previous['meta']['commit']} ({previous_path}):")
+    for name, result in current["results"].items():
+        before = previous["results"].get(name)
+        if before is None:
+            continue
+        deltas = []
+        for label, now, then in (
+            ("rps", result["throughput_rps"], before["throughput_rps"]),
+            ("p50", result["latency_ms"]["p50"], before["latency_ms"]["p50"]),
+            ("p95", result["latency_ms"]["p95"], before["latency_ms"]["p95"]),
+            ("p99", result["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+        ):
+            change = (now - then) / then * 100 if then else 0.0
+            deltas.append(f"{label} {change:+6.1f}%")
+        print(f"{name:<16} " + "  ".join(deltas))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--chats-per-user", type=int, default=20)
+    parser.add_argument("--messages-per-chat", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=50, help="bcrypt makes logins slow")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="fraction of the latency")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="previous result file to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _configure_environment(os.path.join(tmp, "benchmark.db"))
+        report = asyncio.run(run_benchmark(args))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{report['meta']['commit']}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+import random
+
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.chat import Chat, Message
+from app.models.user import User
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+WORDS = (
+    "the model summary document section revenue growth quarter policy customer "
+    "market risk analysis report product team design latency question answer "
+    "context data research result method evidence source chapter figure table"
+).split()
+
+
+def _sentence(rng: random.Random, min_words: int = 6, max_words: int = 40) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def seed_database(
+    db: Session,
+    users: int,
+    chats_per_user: int,
+    messages_per_chat: int,
+    seed: int = 42,
+) -> Dict[str, List]:
+    """Insert benchmark users, chats and messages with deterministic content.
+
+    Returns the created user ids/emails and chat ids per user.
+    """
+    rng = random.Random(seed)
+    # bcrypt is deliberately slow; every benchmark user shares one hash
+    hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+    now = datetime.utcnow()
+
+    db.execute(
+        User.__table__.insert(),
+        [
+            {
+                "username": f"benchuser{i}",
+                "email": f"bench{i}@example.com",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(users)
+        ],
+    )
+    user_rows = (
+        db.query(User.id, User.email)
+        .filter(User.username.like("benchuser%"))
+        .order_by(User.id)
+        .all()
+    )
+
+    db.execute(
+        Chat.__table__.insert(),
+        [
+            {
+                "title": _sentence(rng, 2, 6),
+                "user_id": user_id,
+                "created_at": now - timedelta(days=rng.randint(0, 365)),
+                "updated_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            }
+            for user_id, _ in user_rows
+            for _ in range(chats_per_user)
+        ],
+    )
+    chat_rows = db.query(Chat.id, Chat.user_id).order_by(Chat.id).all()
+
+    batch = []
+    for chat_id, user_id in chat_rows:
+        started = now - timedelta(days=rng.randint(0, 365))
+        for n in range(messages_per_chat):
+            batch.append(
+                {
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "content": " ".join(_sentence(rng) for _ in range(rng.randint(1, 6))),
+                    "role": "user" if n % 2 == 0 else "assistant",
+                    "created_at": started + timedelta(seconds=30 * n),
+                }
+            )
+            if len(batch) >= 5000:
+                db.execute(Message.__table__.insert(), batch)
+                batch = []
+    if batch:
+        db.execute(Message.__table__.insert(), batch)
+
+    db.commit()
+
+    chats_by_user: Dict[int, List[int]] = {}
+    for chat_id, user_id in chat_rows:
+        chats_by_user.setdefault(user_id, []).append(chat_id)
+
+    return {
+        "users": [{"id": user_id, "email": email} for user_id, email in user_rows],
+        "chats_by_user": chats_by_user,
+    }
@@ -0,0 +1,122 @@
+"""Micro-benchmark: cost of reading and serializing one large chat.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization_bench --messages 10000
+
+Compares the previous GET /chat/{id} path (ORM objects validated by the
+pydantic response_model, jsonable_encoder, stdlib json) with the row-tuple +
+orjson path, and reports what gzip/brotli do to the response body.
+"""
+from typing import Callable, Dict
+import argparse
+import gzip
+import json
+import os
+import statistics
+import time
+
+
+def _time(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 2), "min_ms": round(min(samples), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.api.endpoints.chat import CHAT_COLUMNS, MESSAGE_COLUMNS, rows_to_dicts
+    from app.core.config import RESPONSE_GZIP_LEVEL
+    from app.db.database import Base
+    from app.models.chat import Chat, Message
+    from app.models.user import User
+    from app.schemas.chat import Chat as ChatSchema
+    from benchmarks.seed import seed_database
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    seeded = seed_database(db, users=1, chats_per_user=1, messages_per_chat=args.messages)
+    chat_id = next(iter(seeded["chats_by_user"].values()))[0]
+    db.close()
+
+    def orm_path() -> bytes:
+        db = Session()
+        try:
+            chat = db.query(Chat).filter(Chat.id == chat_id).first()
+            if hasattr(ChatSchema, "model_validate"):
+                validated = ChatSchema.model_validate(chat, from_attributes=True)
+            else:
+                # pydantic 1
+                validated = ChatSchema.from_orm(chat)
+            return json.dumps(
+                jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+        finally:
+            db.close()
+
+    def row_path() -> bytes:
+        db = Session()
+        try:
+            chat = db.query(*CHAT_COLUMNS).filter(Chat.id == chat_id).first()
+            messages = (
+                db.query(*MESSAGE_COLUMNS)
+                .filter(Message.chat_id == chat_id)
+                .order_by(Message.id)
+                .all()
+            )
+            result = rows_to_dicts(CHAT_COLUMNS, [chat])[0]
+            result["messages"] = rows_to_dicts(MESSAGE_COLUMNS, messages)
+            return orjson.dumps(result)
+        finally:
+            db.close()
+
+    body = row_path()
+    print(f"Chat with {args.messages} messages, response body {len(body) / 1024:.0f} KiB\n")
+
+    gzip_name = f"gzip (level {RESPONSE_GZIP_LEVEL}, GZipMiddleware)"
+    results = {
+        "orm + pydantic + json": _time(orm_path, args.repeat),
+        "row tuples + orjson": _time(row_path, args.repeat),
+        gzip_name: _time(lambda: gzip.compress(body, RESPONSE_GZIP_LEVEL), args.repeat),
+        "gzip (level 9)": _time(lambda: gzip.compress(body, 9), args.repeat),
+    }
+    sizes = {
+        gzip_name: len(gzip.compress(body, RESPONSE_GZIP_LEVEL)),
+        "gzip (level 9)": len(gzip.compress(body, 9)),
+    }
+
+    try:
+        import brotli
+
+        results["brotli (quality 4, BrotliMiddleware)"] = _time(
+            lambda: brotli.compress(body, quality=4), args.repeat
+        )
+        sizes["brotli (quality 4, BrotliMiddleware)"] = len(brotli.compress(body, quality=4))
+    except ImportError:
+        pass
+
+    for name, timing in results.items():
+        size = f"  -> {sizes[name] / 1024:.0f} KiB" if name in sizes else ""
+        print(f"{name:<38} median {timing['median_ms']:>8.2f} ms  min {timing['min_ms']:>8.2f} ms{size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Gunicorn settings for running the API in production.
+
+Usage: gunicorn -c gunicorn_conf.py app.main:app
+
+The app is imported once in the master (tables and search index are created
+there) and then forked; each worker replaces the database pool and LLM/HTTP
+clients it inherited so no connection is ever shared between processes.
+"""
+import multiprocessing
+
+from app.core.config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    WORKERS_PER_CORE,
+    MAX_WORKERS,
+    WEB_CONCURRENCY,
+    SERVER_KEEPALIVE,
+    SERVER_BACKLOG,
+    SERVER_TIMEOUT,
+    SERVER_GRACEFUL_TIMEOUT,
+)
+
+
+def _worker_count() -> int:
+    if WEB_CONCURRENCY > 0:
+        return WEB_CONCURRENCY
+    workers = max(2, int(multiprocessing.cpu_count() * WORKERS_PER_CORE))
+    if MAX_WORKERS > 0:
+        workers = min(workers, MAX_WORKERS)
+    return workers
+
+
+bind = f"{SERVER_HOST}:{SERVER_PORT}"
+workers = _worker_count()
+worker_class = "app.core.workers.GracefulUvicornWorker"
+preload_app = True
+keepalive = SERVER_KEEPALIVE
+backlog = SERVER_BACKLOG
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    from app.core.rate_limit import reset_backend
+    from app.db.database import engine
+    from app.services.ai_service import ai_service
+    from app.services.url_service import url_service
+
+    # Drop pooled DB connections inherited from the master without closing them
+    # (the master still owns the sockets)
+    engine.dispose(close=False)
+
+    # LLM, HTTP and rate-limit clients are recreated lazily in this worker
+    ai_service.router.reset_clients()
+    url_service.reset()
+    reset_backend()
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Configure the app before anything under app/ is imported
+_tmp = tempfile.mkdtemp(prefix="ai-content-assistant-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["ENVIRONMENT"] = "test"
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.db.database import SessionLocal
+from app.main import app
+from app.models.chat import Chat, Message
+from app.models.user import User
+from app.schemas.chat import Chat as ChatSchema, ChatSummary
+
+
+def validate(schema, data):
+    if hasattr(schema, "model_validate"):
+        return schema.model_validate(data)
+    # pydantic 1
+    return schema.parse_obj(data)
+
+
+def field_names(schema):
+    return set(getattr(schema, "model_fields", None) or schema.__fields__)
+
+
+@pytest.fixture
+def chat():
+    db = SessionLocal()
+    user = User(username="apiuser", email="apiuser@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    chat = Chat(title="Quarterly report", user_id=user.id)
+    db.add(chat)
+    db.flush()
+    db.add_all([
+        Message(chat_id=chat.id, user_id=user.id, content="Summarize it", role="user"),
+        Message(
+            chat_id=chat.id,
+            user_id=user.id,
+            content="Revenue grew.",
+            role="assistant",
+            message_metadata={"key_points": ["growth"]},
+        ),
+    ])
+    db.commit()
+    ids = {"user": user.id, "chat": chat.id}
+    db.close()
+
+    yield ids
+
+    db = SessionLocal()
+    db.query(User).filter(User.id == ids["user"]).delete()
+    db.query(Message).filter(Message.chat_id == ids["chat"]).delete()
+    db.query(Chat).filter(Chat.id == ids["chat"]).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def client(chat):
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token(chat['user'])}"
+    return client
+
+
+def test_get_chats_matches_chat_summary(client, chat):
+    response = client.get("/api/v1/chat/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [summary] = response.json()
+    assert set(summary) == field_names(ChatSummary)
+    assert validate(ChatSummary, summary).message_count == 2
+
+
+def test_get_chat_matches_chat_schema(client, chat):
+    response = client.get(f"/api/v1/chat/{chat['chat']}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == field_names(ChatSchema)
+    validated = validate(ChatSchema, body)
+    assert [message.role for message in validated.messages] == ["user", "assistant"]
+    assert validated.messages[1].message_metadata == {"key_points": ["growth"]}
+    assert set(body["messages"][0]) == field_names(type(validated.messages[0]))
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from app.services.model_router import (
+    CHUNK_MAP,
+    KEY_POINTS,
+    QA,
+    SUMMARY,
+    LLMTimeoutError,
+    ModelRouter,
+    logger,
+)
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        return FakeMessage(f"{self.name} answer")
+
+
+@pytest.fixture
+def records():
+    """Collect routing decisions logged while the test runs."""
+    collected = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            collected.append(json.loads(record.getMessage()))
+
+    handler = Collector()
+    previous_level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield collected
+    logger.removeHandler(handler)
+    logger.setLevel(previous_level)
+
+
+def make_router(delays=None, **kwargs):
+    delays = delays or {}
+    router = ModelRouter(large_model="large", small_model="small", **kwargs)
+    llms = {name: FakeLLM(name, delays.get(name, 0.0)) for name in ("large", "small")}
+    router.get_llm = lambda model: llms[model]
+    return router
+
+
+def test_latency_target_routes_by_input_size():
+    router = make_router(target="latency", small_model_max_tokens=100)
+
+    assert router.route(SUMMARY, "x" * 40).model == "small"
+    assert router.route(SUMMARY, "x" * 4000).model == "large"
+    assert router.route(QA, "x" * 4000).model == "large"
+    assert router.route(KEY_POINTS, "x" * 4000).model == "small"
+    assert router.route(CHUNK_MAP, "x" * 4000).model == "small"
+
+
+def test_cost_and_quality_targets():
+    assert make_router(target="cost").route(SUMMARY, "x" * 100_000).model == "small"
+    assert make_router(target="quality").route(KEY_POINTS, "x").model == "large"
+
+
+def test_unknown_target_is_rejected():
+    with pytest.raises(ValueError):
+        ModelRouter(target="fastest")
+
+
+def test_falls_back_to_other_model_on_timeout(records):
+    router = make_router(delays={"small": 1.0}, timeout=0.05)
+
+    answer = asyncio.run(router.ainvoke(KEY_POINTS, "short input"))
+
+    assert answer == "large answer"
+    assert records[-1]["outcome"] == "fallback"
+    assert records[-1]["model"] == "small"
+    assert records[-1]["used_model"] == "large"
+
+
+def test_timeout_on_both_models_names_task_and_models(records):
+    router = make_router(delays={"small": 1.0, "large": 1.0}, timeout=0.05)
+
+    with pytest.raises(LLMTimeoutError) as error:
+        asyncio.run(router.ainvoke(QA, "short input"))
+
+    assert "qa" in str(error.value)
+    assert "small and large" in str(error.value)
+    assert records[-1]["outcome"] == "timeout"
+
+
+def test_every_decision_is_logged(records):
+    router = make_router()
+
+    asyncio.run(router.ainvoke(SUMMARY, "short input"))
+
+    assert len(records) == 1
+    assert records[0]["task"] == SUMMARY
+    assert records[0]["outcome"] == "ok"
+    assert records[0]["latency_ms"] is not None
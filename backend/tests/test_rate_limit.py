@@ -0,0 +1,136 @@
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core import rate_limit
+from app.core.rate_limit import InMemoryBackend, get_backend, reset_backend
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_MAX_IN_FLIGHT", 1)
+    monkeypatch.setattr(rate_limit, "BUCKETS", {"crud": (1.0, 2), "ai": (1.0, 2)})
+    reset_backend()
+    yield get_backend()
+    reset_backend()
+
+
+@pytest.fixture
+def gate():
+    return {"event": None}
+
+
+@pytest.fixture
+def app(gate):
+    router = APIRouter(dependencies=[Depends(rate_limit.rate_limit)])
+
+    @router.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @router.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    @router.get("/wait")
+    async def wait():
+        await gate["event"].wait()
+        return {"status": "ok"}
+
+    class Batch(BaseModel):
+        urls: List[str]
+
+    @router.post("/chat/process-urls")
+    async def process_urls(batch: Batch):
+        return {"count": len(batch.urls)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def test_returns_429_with_retry_after_when_bucket_is_empty(backend, app):
+    client = TestClient(app)
+
+    assert [client.get("/ok").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/ok")
+
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Rate limit exceeded"
+    assert response.headers["Retry-After"] == "1"
+    assert backend._in_flight == {}
+
+
+def test_in_flight_slot_is_released_when_handler_fails(backend, app):
+    client = TestClient(app, raise_server_exceptions=False)
+
+    assert client.get("/fail").status_code == 500
+    assert backend._in_flight == {}
+    assert client.get("/ok").status_code == 200
+
+
+def test_concurrency_rejection_does_not_spend_a_token(backend, app, gate):
+    async def run():
+        gate["event"] = asyncio.Event()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/wait"))
+            while not backend._in_flight:
+                await asyncio.sleep(0.01)
+            rejected = await client.get("/ok")
+            gate["event"].set()
+            return await first, rejected, await client.get("/ok")
+
+    first, rejected, after = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert rejected.status_code == 429
+    assert rejected.json()["detail"] == "Too many concurrent requests"
+    assert rejected.headers["Retry-After"] == "1"
+    # Two tokens of burst: the waiting request and the one after; the rejected one took none
+    assert after.status_code == 200
+    assert backend._in_flight == {}
+
+
+def test_memory_backend_evicts_least_recently_used_bucket():
+    backend = InMemoryBackend(max_keys=2)
+
+    async def run():
+        await backend.take("a", 1.0, 5)
+        await backend.take("b", 1.0, 5)
+        await backend.take("a", 1.0, 5)
+        await backend.take("c", 1.0, 5)
+
+    asyncio.run(run())
+
+    assert list(backend._buckets) == ["a", "c"]
+
+
+def test_batch_requests_cost_one_token_per_distinct_url(backend, app):
+    client = TestClient(app)
+    urls = ["http://a.example", "http://b.example", "http://a.example", "http://c.example"]
+
+    # Three distinct URLs on a full two-token bucket: allowed, leaving it one token in debt
+    first = client.post("/chat/process-urls", json={"urls": urls})
+    second = client.post("/chat/process-urls", json={"urls": ["http://d.example"]})
+
+    assert first.status_code == 200
+    assert first.json() == {"count": 4}
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "2"
+
+
+def test_unusable_redis_url_falls_back_to_memory(backend, app, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_REDIS_URL", "not-a-redis-url")
+    reset_backend()
+
+    response = TestClient(app).get("/ok")
+
+    assert response.status_code == 200
+    assert isinstance(get_backend(), InMemoryBackend)
@@ -0,0 +1,132 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import search
+from app.db.database import Base
+from app.models.chat import Chat, Message
+from app.models.user import User
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "_fts_dialects", set())
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    search.setup_search_index(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def existing_db(engine):
+    """A database whose messages were stored before the search index existed."""
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_user(db, name):
+    user = User(username=name, email=f"{name}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def add_messages(db, user, *contents):
+    chat = Chat(title=f"{user.username} chat", user_id=user.id)
+    db.add(chat)
+    db.flush()
+    messages = [Message(chat_id=chat.id, user_id=user.id, content=content, role="user") for content in contents]
+    db.add_all(messages)
+    db.commit()
+    return messages
+
+
+def test_results_are_scoped_to_owner(db):
+    alice, bob = add_user(db, "alice"), add_user(db, "bob")
+    add_messages(db, alice, "quarterly revenue grew")
+    add_messages(db, bob, "revenue fell", "revenue forecast")
+
+    rows = search.search_messages(db, alice.id, "revenue")
+
+    assert [row["snippet"] for row in rows] == ["quarterly [revenue] grew"]
+
+
+def test_ranks_matches_and_fetches_one_extra_row(db):
+    alice = add_user(db, "alice")
+    add_messages(
+        db,
+        alice,
+        "revenue once in a long message about many other unrelated things entirely",
+        "revenue revenue revenue",
+        "revenue report",
+    )
+
+    rows = search.search_messages(db, alice.id, "revenue", limit=2)
+
+    assert len(rows) == 3
+    assert rows[0]["snippet"] == "[revenue] [revenue] [revenue]"
+
+
+def test_last_term_matches_as_prefix(db):
+    alice = add_user(db, "alice")
+    add_messages(db, alice, "latency budget")
+
+    assert len(search.search_messages(db, alice.id, "laten")) == 1
+    assert search.search_messages(db, alice.id, "\"*:()") == []
+
+
+def test_index_follows_updates_and_deletes(db):
+    alice = add_user(db, "alice")
+    message, other = add_messages(db, alice, "draft summary", "draft outline")
+
+    message.content = "final summary"
+    db.delete(other)
+    db.commit()
+
+    assert search.search_messages(db, alice.id, "draft") == []
+    assert len(search.search_messages(db, alice.id, "final")) == 1
+
+
+def test_existing_messages_use_like_until_migrated(engine, existing_db):
+    alice, bob = add_user(existing_db, "alice"), add_user(existing_db, "bob")
+    add_messages(existing_db, alice, "legacy revenue note", "legacy roadmap")
+    add_messages(existing_db, bob, "legacy revenue forecast")
+    with engine.begin() as conn:
+        # Rows written before messages had an owner column
+        conn.execute(text("UPDATE messages SET user_id = NULL"))
+        conn.execute(text("DROP INDEX ix_messages_chat_id"))
+
+    search.setup_search_index(engine)
+
+    assert "sqlite" not in search._fts_dialects
+    assert len(search.search_messages(existing_db, alice.id, "revenue")) == 1
+
+    search.migrate_search_index(engine, batch_size=1)
+    add_messages(existing_db, alice, "revenue added after the migration")
+
+    assert "sqlite" in search._fts_dialects
+    rows = search.search_messages(existing_db, alice.id, "revenue")
+    assert sorted(row["snippet"] for row in rows) == [
+        "[revenue] added after the migration",
+        "legacy [revenue] note",
+    ]
+    assert existing_db.execute(text("SELECT count(*) FROM messages WHERE user_id IS NULL")).scalar() == 0
+    indexes = {row[0] for row in existing_db.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert {"ix_messages_chat_id", "ix_chats_user_id"} <= indexes
+
+
+def test_like_fallback_escapes_wildcards(existing_db):
+    alice = add_user(existing_db, "alice")
+    add_messages(existing_db, alice, "growth of 50% this year", "growth of 50 units", "snake_case name", "snakeXcase")
+
+    assert len(search.search_messages(existing_db, alice.id, "50%")) == 1
+    assert len(search.search_messages(existing_db, alice.id, "snake_case")) == 1
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+import pytest
+
+from app.services.single_flight import SingleFlight, content_key
+
+
+class Work:
+    """A computation that runs until released and records how it ended."""
+
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_content_key_separates_parts():
+    assert content_key("qa", "ab", "c") != content_key("qa", "a", "bc")
+    assert content_key("qa", "ab", "c") == content_key("qa", "ab", "c")
+    assert content_key("qa", "x") != content_key("summary", "x")
+
+
+def test_concurrent_calls_share_one_computation(caplog):
+    async def run():
+        flight, work = SingleFlight(), Work()
+        waiters = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+        await settle()
+        assert flight.in_flight() == 1
+        work.release.set()
+        return flight, work, await asyncio.gather(*waiters)
+
+    with caplog.at_level(logging.DEBUG, logger="app.services.single_flight"):
+        flight, work, results = asyncio.run(run())
+
+    assert results == ["done"] * 3
+    assert work.started == 1
+    assert flight.coalesced == 2
+    assert flight.in_flight() == 0
+    assert "2 coalesced so far" in caplog.text
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def run():
+        flight, work = SingleFlight(), Work()
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await settle()
+        first.cancel()
+        await settle()
+        work.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return work, await second
+
+    work, result = asyncio.run(run())
+
+    assert result == "done"
+    assert work.cancelled is False
+
+
+def test_work_is_cancelled_and_forgotten_when_every_waiter_leaves():
+    async def run():
+        flight, work = SingleFlight(), Work()
+        waiters = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+        await settle()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await settle()
+        assert work.cancelled is True
+        assert flight.in_flight() == 0
+
+        # A later caller starts fresh instead of joining the cancelled task
+        fresh = Work("again")
+        fresh.release.set()
+        return await flight.do("k", fresh)
+
+    assert asyncio.run(run()) == "again"
+
+
+def test_exception_reaches_every_waiter_and_is_not_kept():
+    async def run():
+        flight, work = SingleFlight(), Work(error=ValueError("bad input"))
+        waiters = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+        await settle()
+        work.release.set()
+        outcomes = await asyncio.gather(*waiters, return_exceptions=True)
+
+        retry = Work("ok")
+        retry.release.set()
+        return outcomes, await flight.do("k", retry), flight.in_flight()
+
+    outcomes, retried, in_flight = asyncio.run(run())
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert retried == "ok"
+    assert in_flight == 0
@@ -0,0 +1,314 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.ai_service import ai_service
+from app.services.url_service import URLService
+
+HTML = (
+    "<html><head><script>var tracking = 1;</script></head><body>"
+    "<nav>Home About</nav><article><h1>Title</h1><p>Main content here.</p></article>"
+    "<footer>Copyright</footer></body></html>"
+)
+
+
+def make_pdf(text: str) -> bytes:
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+@pytest.fixture
+def summarized(monkeypatch):
+    """Replace the LLM pipeline with a recorder; returns the texts it was given."""
+    calls = []
+
+    async def process_text(text):
+        calls.append(text)
+        return {"summary": f"summary of {len(text)} chars", "key_points": [], "status": "success"}
+
+    monkeypatch.setattr(ai_service, "process_text", process_text)
+    return calls
+
+
+def make_service(handler, **kwargs) -> URLService:
+    kwargs.setdefault("allowed_private_hosts", ["testserver"])
+    return URLService(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_html_extracts_main_content(summarized):
+    service = make_service(lambda request: httpx.Response(200, html=HTML))
+
+    result = asyncio.run(service.process_url("http://testserver/page"))
+
+    assert result["status"] == "success"
+    assert result["source"]["content_type"] == "text/html"
+    assert summarized == ["Title\nMain content here."]
+
+
+def test_pdf_is_parsed_as_pdf(summarized):
+    pdf = make_pdf("Quarterly revenue grew")
+    service = make_service(
+        lambda request: httpx.Response(200, content=pdf, headers={"Content-Type": "application/pdf"})
+    )
+
+    result = asyncio.run(service.process_url("http://testserver/report.pdf"))
+
+    assert result["status"] == "success"
+    assert result["source"]["content_type"] == "application/pdf"
+    assert "Quarterly revenue grew" in summarized[0]
+
+
+def test_etag_revalidation_does_not_resummarize(summarized):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html=HTML, headers={"ETag": '"v1"'})
+
+    service = make_service(handler)
+
+    async def run():
+        return [await service.process_url("http://testserver/page") for _ in range(2)]
+
+    first, second = asyncio.run(run())
+
+    assert len(requests) == 2
+    assert len(summarized) == 1
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["summary"] == first["summary"]
+
+
+def test_last_modified_revalidation_does_not_resummarize(summarized):
+    stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def handler(request):
+        if request.headers.get("If-Modified-Since") == stamp:
+            return httpx.Response(304)
+        return httpx.Response(200, html=HTML, headers={"Last-Modified": stamp})
+
+    service = make_service(handler)
+
+    async def run():
+        return [await service.process_url("http://testserver/page") for _ in range(2)]
+
+    _, second = asyncio.run(run())
+
+    assert len(summarized) == 1
+    assert second["cached"] is True
+
+
+def test_cached_text_is_dropped_once_summarized(summarized):
+    service = make_service(lambda request: httpx.Response(200, html=HTML, headers={"ETag": '"v1"'}))
+
+    asyncio.run(service.process_url("http://testserver/page"))
+
+    entry = service._cache["http://testserver/page"]
+    assert entry.text is None
+    assert entry.result is not None
+
+
+def test_resummarizes_after_failed_summary(monkeypatch):
+    outcomes = [{"status": "error", "message": "LLM down"}, {"summary": "ok", "key_points": [], "status": "success"}]
+
+    async def process_text(text):
+        return outcomes.pop(0)
+
+    monkeypatch.setattr(ai_service, "process_text", process_text)
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html=HTML, headers={"ETag": '"v1"'})
+
+    service = make_service(handler)
+
+    async def run():
+        return [await service.process_url("http://testserver/page") for _ in range(2)]
+
+    first, second = asyncio.run(run())
+
+    assert first["status"] == "error"
+    assert second["status"] == "success"
+    assert second["cached"] is False
+
+
+def test_rejects_large_content_length(summarized):
+    service = make_service(lambda request: httpx.Response(200, html="x" * 2000), max_bytes=1000)
+
+    result = asyncio.run(service.process_url("http://testserver/big"))
+
+    assert result["status"] == "error"
+    assert "larger than 1000 bytes" in result["message"]
+    assert summarized == []
+
+
+def test_rejects_large_streamed_body(summarized):
+    async def body():
+        for _ in range(10):
+            yield b"<p>" + b"x" * 200 + b"</p>"
+
+    def handler(request):
+        # No Content-Length: the limit has to be enforced while streaming
+        return httpx.Response(200, content=body(), headers={"Content-Type": "text/html"})
+
+    service = make_service(handler, max_bytes=1000)
+
+    result = asyncio.run(service.process_url("http://testserver/stream"))
+
+    assert result["status"] == "error"
+    assert "larger than 1000 bytes" in result["message"]
+
+
+def test_times_out(summarized):
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, html=HTML)
+
+    service = make_service(handler, timeout=0.05)
+
+    result = asyncio.run(service.process_url("http://testserver/slow"))
+
+    assert result["status"] == "error"
+    assert "Timed out" in result["message"]
+
+
+def test_per_host_concurrency_is_capped(summarized):
+    active = {"now": 0, "max": 0}
+
+    async def handler(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return httpx.Response(200, html=f"<p>{request.url.path}</p>")
+
+    service = make_service(handler, max_connections_per_host=2)
+    urls = [f"http://testserver/page{i}" for i in range(6)]
+
+    results = asyncio.run(service.process_urls(urls))
+
+    assert all(result["status"] == "success" for result in results)
+    assert active["max"] == 2
+
+
+def test_process_urls_keeps_input_order_with_duplicates(summarized):
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, html=f"<p>{request.url.path}</p>")
+
+    service = make_service(handler)
+    urls = ["http://testserver/b", "http://testserver/a", "http://testserver/b", "http://testserver/c"]
+
+    results = asyncio.run(service.process_urls(urls))
+
+    assert [result["source"]["url"] for result in results] == urls
+    assert sorted(requests) == ["/a", "/b", "/c"]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.5:5432/",
+        "http://[::1]/",
+        "http://[::ffff:127.0.0.1]/",
+        "file:///etc/passwd",
+    ],
+)
+def test_refuses_non_public_destinations(summarized, url):
+    requests = []
+    service = make_service(lambda request: requests.append(request) or httpx.Response(200, html=HTML))
+
+    result = asyncio.run(service.process_url(url))
+
+    assert result["status"] == "error"
+    assert requests == []
+
+
+def test_refuses_redirect_to_private_address(summarized):
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(302, headers={"Location": "http://169.254.169.254/latest/meta-data/"})
+
+    service = make_service(handler)
+
+    result = asyncio.run(service.process_url("http://testserver/redirect"))
+
+    assert result["status"] == "error"
+    assert "not a public address" in result["message"]
+    assert requests == ["http://testserver/redirect"]
+
+
+def test_follows_allowed_redirects(summarized):
+    def handler(request):
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "/new"})
+        return httpx.Response(200, html=HTML)
+
+    service = make_service(handler)
+
+    result = asyncio.run(service.process_url("http://testserver/old"))
+
+    assert result["status"] == "success"
+
+
+def test_connects_to_the_validated_address(summarized):
+    requests = []
+    lookups = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, html=HTML)
+
+    service = make_service(handler)
+
+    async def resolve(host, port):
+        # A rebinding resolver: public for the check, loopback afterwards
+        lookups.append(host)
+        return ["93.184.216.34"] if len(lookups) == 1 else ["127.0.0.1"]
+
+    service._resolve = resolve
+
+    result = asyncio.run(service.process_url("https://rebind.example:8443/page"))
+
+    assert result["status"] == "success"
+    assert lookups == ["rebind.example"]
+    assert requests[0].url.host == "93.184.216.34"
+    assert requests[0].headers["Host"] == "rebind.example:8443"
+    assert requests[0].extensions["sni_hostname"] == "rebind.example"
+    assert result["source"]["url"] == "https://rebind.example:8443/page"
+
+
+def test_host_limits_are_dropped_when_idle(summarized):
+    service = make_service(lambda request: httpx.Response(200, html=f"<p>{request.url.host}</p>"))
+    urls = [f"http://testserver/page{i}" for i in range(3)]
+
+    asyncio.run(service.process_urls(urls))
+
+    assert service._host_limits == {}